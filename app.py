@@ -4,9 +4,15 @@ import sqlite3
 import random
 import string
 import os
+import json
+import time
+import threading
 from datetime import datetime
+from pathlib import Path
 import hashlib
 
+from schema import create_tables, create_kundas
+
 app = Flask(__name__)
 app.secret_key = 'gayathri-homa-secret-key-2024-shrimitra-networks'
 CORS(app)
@@ -14,71 +20,19 @@ CORS(app)
 # Admin credentials
 ADMIN_PASSWORD = "shrimitranet"  # Admin password
 
+# Database files (the archive is written by archive.py)
+DATABASE = os.environ.get('GAYATHRI_DB_PATH', 'gayathri_homa.db')
+ARCHIVE_DATABASE = os.environ.get('GAYATHRI_ARCHIVE_DB_PATH', 'gayathri_homa_archive.db')
+
 # Database setup
-def init_db():
-    conn = sqlite3.connect('gayathri_homa.db')
+def init_db(db_path=None):
+    conn = sqlite3.connect(db_path or DATABASE)
     cursor = conn.cursor()
     
-    # User Registration table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_registration (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            phone TEXT UNIQUE NOT NULL,
-            email TEXT NOT NULL,
-            members_count INTEGER NOT NULL,
-            registration_id TEXT UNIQUE NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Homa Kunda table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS homa_kunda (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            kunda_number INTEGER UNIQUE NOT NULL,
-            status TEXT DEFAULT 'available',
-            booked_by_id INTEGER,
-            FOREIGN KEY (booked_by_id) REFERENCES user_registration (id)
-        )
-    ''')
-    
-    # Booking table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS booking (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            kunda_id INTEGER NOT NULL,
-            status TEXT DEFAULT 'pending',
-            booking_id TEXT UNIQUE NOT NULL,
-            booked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            approved_at DATETIME,
-            admin_notes TEXT,
-            FOREIGN KEY (user_id) REFERENCES user_registration (id),
-            FOREIGN KEY (kunda_id) REFERENCES homa_kunda (id),
-            UNIQUE(user_id, kunda_id)
-        )
-    ''')
-    
-    # Admin table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS admin_users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    create_tables(cursor)
     
     # Initialize kundas if not exists
-    cursor.execute('SELECT COUNT(*) FROM homa_kunda')
-    count = cursor.fetchone()[0]
-    if count == 0:
-        for i in range(1, 101):
-            cursor.execute(
-                'INSERT INTO homa_kunda (kunda_number, status) VALUES (?, ?)',
-                (i, 'available')
-            )
+    if create_kundas(cursor):
         print("✅ 100 kundas initialized successfully!")
     
     # Initialize admin user if not exists
@@ -107,13 +61,122 @@ def generate_booking_id():
     return f"{prefix}{random_chars}"
 
 def get_db_connection():
-    conn = sqlite3.connect('gayathri_homa.db')
+    conn = sqlite3.connect(DATABASE)
     conn.row_factory = sqlite3.Row
     return conn
 
+def get_archive_connection():
+    # Read-only connection to the archive written by archive.py
+    uri = Path(ARCHIVE_DATABASE).resolve().as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def attach_archive(conn):
+    # Lets live queries also count rows archive.py has moved out (only ever
+    # read through this connection). Returns False if there is no archive yet.
+    if not os.path.exists(ARCHIVE_DATABASE):
+        return False
+    conn.execute('ATTACH DATABASE ? AS archive', (ARCHIVE_DATABASE,))
+    return True
+
+def get_page_args():
+    # Raises ValueError for a non-numeric limit/offset or a negative offset
+    limit = max(1, min(int(request.args.get('limit', 500)), 5000))
+    offset = int(request.args.get('offset', 0))
+    if offset < 0:
+        raise ValueError('offset must not be negative')
+    return limit, offset
+
 def is_admin_logged_in():
     return session.get('admin_logged_in', False)
 
+# Seat map cache
+# The compact seat map is rebuilt only after a booking state change. The TTL is
+# a safety net for writes made outside this process (e.g. manual DB edits).
+SEATMAP_CACHE_TTL = 30  # seconds
+seatmap_cache = {'version': 0, 'body': None, 'etag': None, 'built_at': 0}
+seatmap_lock = threading.Lock()
+
+def invalidate_seatmap():
+    with seatmap_lock:
+        seatmap_cache['version'] += 1
+        seatmap_cache['body'] = None
+        seatmap_cache['etag'] = None
+
+def build_seatmap(cursor):
+    """Build the compact seat map payload.
+
+    f: number of the first kunda
+    n: total number of kundas
+    r: run lengths over kundas in number order, alternating available/booked
+       and always starting with an available run (which may be 0)
+    d: dictionary of booked-by names
+    b: index into d for each booked kunda in order (-1 if unknown)
+    """
+    cursor.execute('''
+        SELECT k.kunda_number, k.status, u.name as booked_by_name
+        FROM homa_kunda k
+        LEFT JOIN user_registration u ON k.booked_by_id = u.id
+        ORDER BY k.kunda_number
+    ''')
+    rows = cursor.fetchall()
+
+    runs = [0]
+    names = []
+    name_index = {}
+    booked_by = []
+    current_available = True
+    for row in rows:
+        available = row['status'] == 'available'
+        if available != current_available:
+            runs.append(0)
+            current_available = available
+        runs[-1] += 1
+
+        if not available:
+            name = row['booked_by_name']
+            if name is None:
+                booked_by.append(-1)
+            else:
+                if name not in name_index:
+                    name_index[name] = len(names)
+                    names.append(name)
+                booked_by.append(name_index[name])
+
+    return {
+        'f': rows[0]['kunda_number'] if rows else 1,
+        'n': len(rows),
+        'r': runs,
+        'd': names,
+        'b': booked_by
+    }
+
+def get_seatmap():
+    """Return (body, etag) for the seat map, rebuilding it if stale."""
+    with seatmap_lock:
+        version = seatmap_cache['version']
+        if seatmap_cache['body'] is not None and time.time() - seatmap_cache['built_at'] < SEATMAP_CACHE_TTL:
+            return seatmap_cache['body'], seatmap_cache['etag']
+
+    conn = get_db_connection()
+    try:
+        payload = build_seatmap(conn.cursor())
+    finally:
+        conn.close()
+
+    body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    etag = hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+    with seatmap_lock:
+        # Don't store a map built before a concurrent invalidation
+        if seatmap_cache['version'] == version:
+            seatmap_cache['body'] = body
+            seatmap_cache['etag'] = etag
+            seatmap_cache['built_at'] = time.time()
+
+    return body, etag
+
 # Routes
 @app.route('/')
 def home():
@@ -208,6 +271,17 @@ def admin_stats():
         cursor.execute('SELECT COUNT(*) FROM booking WHERE status = "rejected"')
         rejected_bookings = cursor.fetchone()[0]
         
+        # Rejected bookings archived for users who are still registered
+        if attach_archive(conn):
+            cursor.execute('''
+                SELECT COUNT(*) FROM archive.booking
+                WHERE status = 'rejected'
+                  AND registration_id IN (SELECT registration_id FROM main.user_registration)
+            ''')
+            archived_rejected = cursor.fetchone()[0]
+            total_bookings += archived_rejected
+            rejected_bookings += archived_rejected
+        
         conn.close()
         
         return jsonify({
@@ -272,14 +346,33 @@ def admin_all_users():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT u.*, 
-                   (SELECT COUNT(*) FROM booking WHERE user_id = u.id) as booking_count,
-                   (SELECT status FROM booking WHERE user_id = u.id LIMIT 1) as booking_status,
-                   (SELECT kunda_number FROM homa_kunda WHERE id = (SELECT kunda_id FROM booking WHERE user_id = u.id LIMIT 1)) as kunda_number
-            FROM user_registration u
-            ORDER BY u.created_at DESC
-        ''')
+        # Fall back to bookings archive.py has moved out. Archived rows are
+        # matched on registration_id, which survives a reset of the live DB.
+        if attach_archive(conn):
+            cursor.execute('''
+                SELECT u.*,
+                       (SELECT COUNT(*) FROM booking WHERE user_id = u.id)
+                           + (SELECT COUNT(*) FROM archive.booking WHERE registration_id = u.registration_id) as booking_count,
+                       COALESCE(
+                           (SELECT status FROM booking WHERE user_id = u.id LIMIT 1),
+                           (SELECT status FROM archive.booking WHERE registration_id = u.registration_id LIMIT 1)
+                       ) as booking_status,
+                       COALESCE(
+                           (SELECT kunda_number FROM homa_kunda WHERE id = (SELECT kunda_id FROM booking WHERE user_id = u.id LIMIT 1)),
+                           (SELECT kunda_number FROM archive.booking WHERE registration_id = u.registration_id LIMIT 1)
+                       ) as kunda_number
+                FROM user_registration u
+                ORDER BY u.created_at DESC
+            ''')
+        else:
+            cursor.execute('''
+                SELECT u.*, 
+                       (SELECT COUNT(*) FROM booking WHERE user_id = u.id) as booking_count,
+                       (SELECT status FROM booking WHERE user_id = u.id LIMIT 1) as booking_status,
+                       (SELECT kunda_number FROM homa_kunda WHERE id = (SELECT kunda_id FROM booking WHERE user_id = u.id LIMIT 1)) as kunda_number
+                FROM user_registration u
+                ORDER BY u.created_at DESC
+            ''')
         
         users = [dict(row) for row in cursor.fetchall()]
         conn.close()
@@ -296,6 +389,107 @@ def admin_all_users():
             'error': 'Failed to load users'
         }), 500
 
+@app.route('/api/admin/archive/bookings', methods=['GET'])
+def admin_archived_bookings():
+    if not is_admin_logged_in():
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+    
+    try:
+        limit, offset = get_page_args()
+        status = request.args.get('status')
+        
+        if not os.path.exists(ARCHIVE_DATABASE):
+            return jsonify({
+                'success': True,
+                'bookings': [],
+                'total': 0
+            })
+        
+        conn = get_archive_connection()
+        cursor = conn.cursor()
+        
+        where = 'WHERE status = ?' if status else ''
+        params = (status,) if status else ()
+        
+        cursor.execute(f'SELECT COUNT(*) FROM booking {where}', params)
+        total = cursor.fetchone()[0]
+        
+        cursor.execute(f'''
+            SELECT * FROM booking
+            {where}
+            ORDER BY archived_at DESC, id DESC
+            LIMIT ? OFFSET ?
+        ''', params + (limit, offset))
+        
+        bookings = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'bookings': bookings,
+            'total': total
+        })
+        
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid limit or offset'
+        }), 400
+    except Exception as e:
+        print(f"❌ Archived bookings error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to load archived bookings'
+        }), 500
+
+@app.route('/api/admin/archive/users', methods=['GET'])
+def admin_archived_users():
+    if not is_admin_logged_in():
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+    
+    try:
+        limit, offset = get_page_args()
+        
+        if not os.path.exists(ARCHIVE_DATABASE):
+            return jsonify({
+                'success': True,
+                'users': [],
+                'total': 0
+            })
+        
+        conn = get_archive_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT COUNT(*) FROM user_registration')
+        total = cursor.fetchone()[0]
+        
+        cursor.execute('''
+            SELECT * FROM user_registration
+            ORDER BY archived_at DESC, id DESC
+            LIMIT ? OFFSET ?
+        ''', (limit, offset))
+        
+        users = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'users': users,
+            'total': total
+        })
+        
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid limit or offset'
+        }), 400
+    except Exception as e:
+        print(f"❌ Archived users error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to load archived users'
+        }), 500
+
 @app.route('/api/register', methods=['POST'])
 def register_user():
     try:
@@ -398,6 +592,23 @@ def get_kundas():
             'error': 'Failed to load kundas'
         }), 500
 
+@app.route('/api/kundas/seatmap', methods=['GET'])
+def get_kundas_seatmap():
+    try:
+        body, etag = get_seatmap()
+
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+
+    except Exception as e:
+        print(f"❌ Seat map error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to load seat map'
+        }), 500
+
 @app.route('/api/bookings', methods=['POST'])
 def create_booking():
     try:
@@ -414,7 +625,7 @@ def create_booking():
         cursor = conn.cursor()
         
         # Check if user exists
-        cursor.execute('SELECT id FROM user_registration WHERE id = ?', (data['user_id'],))
+        cursor.execute('SELECT id, registration_id FROM user_registration WHERE id = ?', (data['user_id'],))
         user_result = cursor.fetchone()
         if not user_result:
             conn.close()
@@ -443,9 +654,13 @@ def create_booking():
                 'error': 'Selected kunda is not available. Please choose another.'
             }), 400
         
-        # Check if user already has a booking
+        # Check if user already has a booking, including one archive.py has moved out
         cursor.execute('SELECT id FROM booking WHERE user_id = ?', (data['user_id'],))
-        if cursor.fetchone():
+        existing = cursor.fetchone()
+        if not existing and attach_archive(conn):
+            cursor.execute('SELECT id FROM archive.booking WHERE registration_id = ?', (user_result['registration_id'],))
+            existing = cursor.fetchone()
+        if existing:
             conn.close()
             return jsonify({
                 'success': False,
@@ -481,6 +696,7 @@ def create_booking():
         
         conn.commit()
         conn.close()
+        invalidate_seatmap()
         
         print(f"✅ Booking created: Kunda {data['kunda_number']} - {booking_id}")
         
@@ -595,6 +811,7 @@ def admin_booking_action(action):
         
         conn.commit()
         conn.close()
+        invalidate_seatmap()
         
         print(f"✅ Admin action: {action} on booking {booking_id} by {session.get('admin_username')}")
         
@@ -0,0 +1,192 @@
+"""Move rejected and completed-event rows out of the live database.
+
+Rows are copied into the archive database and deleted from the live one in
+small batches, each in its own transaction, so the job can run while the site
+is live and can simply be re-run if it is interrupted.
+
+    python archive.py                      # archive rejected bookings
+    python archive.py --event-completed    # archive all bookings and users, free every kunda
+    python archive.py --vacuum             # full VACUUM (locks the site while it runs)
+
+Admins can read archived rows through /api/admin/archive/bookings and
+/api/admin/archive/users. The admin stats, the admin user list and the
+one-booking-per-user check in create_booking all look in the archive too,
+matching rows on registration_id.
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+DATABASE = os.environ.get('GAYATHRI_DB_PATH', 'gayathri_homa.db')
+ARCHIVE_DATABASE = os.environ.get('GAYATHRI_ARCHIVE_DB_PATH', 'gayathri_homa_archive.db')
+
+def init_archive_db(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive.user_registration (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            email TEXT NOT NULL,
+            members_count INTEGER NOT NULL,
+            registration_id TEXT NOT NULL,
+            created_at DATETIME,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # User and kunda details are copied in so archived bookings stay readable
+    # after the user is archived or the live database is reset
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive.booking (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            kunda_number INTEGER,
+            status TEXT,
+            booking_id TEXT NOT NULL,
+            booked_at DATETIME,
+            approved_at DATETIME,
+            admin_notes TEXT,
+            name TEXT,
+            phone TEXT,
+            email TEXT,
+            registration_id TEXT,
+            members_count INTEGER,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    conn.execute('CREATE INDEX IF NOT EXISTS archive.idx_booking_status ON booking (status)')
+    conn.execute('CREATE INDEX IF NOT EXISTS archive.idx_booking_archived_at ON booking (archived_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS archive.idx_booking_registration_id ON booking (registration_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS archive.idx_user_archived_at ON user_registration (archived_at)')
+
+def run_batches(conn, select_sql, move, batch_size, pause):
+    # Each batch is selected and moved inside one write transaction, so an
+    # interrupted run leaves every row either archived or still live
+    total = 0
+    while True:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            ids = [row[0] for row in conn.execute(select_sql, (batch_size,))]
+            if ids:
+                move(ids)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        if not ids:
+            return total
+
+        total += len(ids)
+        print(f"   ... {total} rows archived")
+        time.sleep(pause)
+
+def archive_bookings(conn, where, batch_size, pause):
+    def move(ids):
+        placeholders = ','.join('?' * len(ids))
+        conn.execute(f'''
+            INSERT INTO archive.booking (
+                original_id, user_id, kunda_number, status, booking_id, booked_at,
+                approved_at, admin_notes, name, phone, email, registration_id, members_count
+            )
+            SELECT b.id, b.user_id, k.kunda_number, b.status, b.booking_id, b.booked_at,
+                   b.approved_at, b.admin_notes, u.name, u.phone, u.email, u.registration_id, u.members_count
+            FROM main.booking b
+            LEFT JOIN main.user_registration u ON b.user_id = u.id
+            LEFT JOIN main.homa_kunda k ON b.kunda_id = k.id
+            WHERE b.id IN ({placeholders})
+            ORDER BY b.id
+        ''', ids)
+        conn.execute(f'DELETE FROM main.booking WHERE id IN ({placeholders})', ids)
+
+    return run_batches(
+        conn, f'SELECT id FROM main.booking WHERE {where} ORDER BY id LIMIT ?',
+        move, batch_size, pause
+    )
+
+def archive_users(conn, batch_size, pause):
+    def move(ids):
+        placeholders = ','.join('?' * len(ids))
+        conn.execute(f'''
+            INSERT INTO archive.user_registration (
+                original_id, name, phone, email, members_count, registration_id, created_at
+            )
+            SELECT id, name, phone, email, members_count, registration_id, created_at
+            FROM main.user_registration
+            WHERE id IN ({placeholders})
+            ORDER BY id
+        ''', ids)
+        conn.execute(f'DELETE FROM main.user_registration WHERE id IN ({placeholders})', ids)
+
+    # Only users with nothing left pointing at them
+    return run_batches(conn, '''
+        SELECT u.id FROM main.user_registration u
+        WHERE NOT EXISTS (SELECT 1 FROM main.booking b WHERE b.user_id = u.id)
+          AND NOT EXISTS (SELECT 1 FROM main.homa_kunda k WHERE k.booked_by_id = u.id)
+        ORDER BY u.id LIMIT ?
+    ''', move, batch_size, pause)
+
+def compact(conn, full_vacuum, pause, pages_per_step=1000):
+    if full_vacuum:
+        # Switching to incremental mode only takes effect after a full VACUUM;
+        # later runs can then reclaim space in small steps
+        print("🧹 Running full VACUUM...")
+        conn.execute('PRAGMA main.auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM main')
+    elif conn.execute('PRAGMA main.auto_vacuum').fetchone()[0] == 2:
+        print("🧹 Running incremental vacuum...")
+        while conn.execute('PRAGMA main.freelist_count').fetchone()[0] > 0:
+            conn.execute(f'PRAGMA main.incremental_vacuum({int(pages_per_step)})').fetchall()
+            time.sleep(pause)
+    else:
+        print("ℹ️  Skipping vacuum: auto_vacuum is not incremental, run once with --vacuum")
+
+    conn.execute('ANALYZE main')
+    conn.execute('ANALYZE archive')
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive past Gayathri Homa bookings and registrations.')
+    parser.add_argument('--event-completed', action='store_true',
+                        help='archive every booking and registration and free all kundas')
+    parser.add_argument('--vacuum', action='store_true',
+                        help='run a full VACUUM and enable incremental vacuum for later runs')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--pause', type=float, default=0.2,
+                        help='seconds to sleep between batches')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DATABASE, timeout=30, isolation_level=None)
+    conn.execute('ATTACH DATABASE ? AS archive', (ARCHIVE_DATABASE,))
+    init_archive_db(conn)
+
+    print("📦 Archiving rejected bookings...")
+    moved = archive_bookings(conn, "status = 'rejected'", args.batch_size, args.pause)
+    print(f"✅ {moved} rejected bookings archived")
+
+    if args.event_completed:
+        print("📦 Archiving all bookings for the completed event...")
+        moved = archive_bookings(conn, '1 = 1', args.batch_size, args.pause)
+        print(f"✅ {moved} bookings archived")
+
+        # Only free kundas without a live booking, so a booking made after the
+        # last batch keeps its kunda
+        conn.execute('''
+            UPDATE main.homa_kunda SET status = 'available', booked_by_id = NULL
+            WHERE id NOT IN (SELECT kunda_id FROM main.booking WHERE status != 'rejected')
+        ''')
+        print("✅ Kundas without a live booking are available again")
+
+        print("📦 Archiving registrations...")
+        moved = archive_users(conn, args.batch_size, args.pause)
+        print(f"✅ {moved} registrations archived")
+
+    compact(conn, args.vacuum, args.pause)
+    conn.close()
+    print("✅ Archival complete!")
+
+if __name__ == '__main__':
+    main()
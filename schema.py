@@ -0,0 +1,69 @@
+"""Live database schema, shared by app.py and seed_fixtures.py.
+
+Importing this module has no side effects, unlike importing app.
+"""
+
+TOTAL_KUNDAS = 100
+
+def create_tables(cursor):
+    # User Registration table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_registration (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            phone TEXT UNIQUE NOT NULL,
+            email TEXT NOT NULL,
+            members_count INTEGER NOT NULL,
+            registration_id TEXT UNIQUE NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Homa Kunda table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS homa_kunda (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kunda_number INTEGER UNIQUE NOT NULL,
+            status TEXT DEFAULT 'available',
+            booked_by_id INTEGER,
+            FOREIGN KEY (booked_by_id) REFERENCES user_registration (id)
+        )
+    ''')
+    
+    # Booking table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS booking (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            kunda_id INTEGER NOT NULL,
+            status TEXT DEFAULT 'pending',
+            booking_id TEXT UNIQUE NOT NULL,
+            booked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            approved_at DATETIME,
+            admin_notes TEXT,
+            FOREIGN KEY (user_id) REFERENCES user_registration (id),
+            FOREIGN KEY (kunda_id) REFERENCES homa_kunda (id),
+            UNIQUE(user_id, kunda_id)
+        )
+    ''')
+    
+    # Admin table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS admin_users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def create_kundas(cursor):
+    # Returns True if the kundas were created, False if they already existed
+    cursor.execute('SELECT COUNT(*) FROM homa_kunda')
+    if cursor.fetchone()[0] > 0:
+        return False
+    cursor.executemany(
+        'INSERT INTO homa_kunda (kunda_number, status) VALUES (?, ?)',
+        ((i, 'available') for i in range(1, TOTAL_KUNDAS + 1))
+    )
+    return True
@@ -0,0 +1,225 @@
+"""Generate a large, reproducible synthetic database for tests and benchmarks.
+
+The current event is written to a live database with the app's schema. Past
+events go to a matching archive database in the layout archive.py produces.
+The same --seed always produces the same rows.
+
+    python seed_fixtures.py --users 100000 --events 3 --out fixtures/homa_100k.db
+    GAYATHRI_DB_PATH=fixtures/homa_100k.db \\
+        GAYATHRI_ARCHIVE_DB_PATH=fixtures/homa_100k_archive.db python app.py
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from archive import init_archive_db
+from schema import TOTAL_KUNDAS, create_kundas, create_tables
+
+EVENT_DATE = datetime(2025, 11, 16, 6, 0, 0)  # current event; past events are a year apart
+REGISTRATION_WINDOW = timedelta(days=60)
+ID_CHARS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+ID_SCRAMBLE = 2654435761  # coprime with 36**8 and 4 * 10**9, so the mappings below are one-to-one
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Ananya', 'Arjun', 'Bhavana', 'Chaitanya', 'Deepa', 'Ganesh',
+    'Gayathri', 'Harish', 'Indira', 'Karthik', 'Kavya', 'Lakshmi', 'Madhav', 'Meera',
+    'Nandini', 'Pooja', 'Pradeep', 'Raghav', 'Rekha', 'Sanjay', 'Shreya', 'Srinivas',
+    'Sudha', 'Suresh', 'Usha', 'Varun', 'Vidya', 'Vishwanath'
+]
+LAST_NAMES = [
+    'Acharya', 'Bhat', 'Hegde', 'Iyer', 'Joshi', 'Kamath', 'Kulkarni', 'Murthy',
+    'Nair', 'Rao', 'Reddy', 'Sastry', 'Sharma', 'Shenoy', 'Subramanian', 'Vishwamitra'
+]
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.co.in', 'outlook.com', 'rediffmail.com']
+
+def format_ts(value):
+    # Same format SQLite's CURRENT_TIMESTAMP produces
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+def scrambled_id(prefix, n):
+    value = (n * ID_SCRAMBLE) % (36 ** 8)
+    chars = []
+    for _ in range(8):
+        value, digit = divmod(value, 36)
+        chars.append(ID_CHARS[digit])
+    return prefix + ''.join(chars)
+
+def phone_number(n):
+    return str(6000000000 + (n * ID_SCRAMBLE) % 4000000000)
+
+def generate_event(rng, event_date, first_id, users, booked_kundas, rejected_ratio, chunk_size=50000):
+    """Yield (users, bookings) chunks for one event.
+
+    Users are (id, name, phone, email, members_count, registration_id, created_at).
+    Bookings are (id, user_id, kunda_number, status, booking_id, booked_at, approved_at).
+    Like the app, every user has at most one booking and each kunda at most
+    one pending or approved booking. A booking is always in the same chunk as
+    its user.
+    """
+    window_start = event_date - REGISTRATION_WINDOW
+    step = REGISTRATION_WINDOW.total_seconds() / max(users, 1)
+    active_users = set(rng.sample(range(users), min(booked_kundas, TOTAL_KUNDAS, users)))
+    free_kundas = list(range(1, TOTAL_KUNDAS + 1))
+    rng.shuffle(free_kundas)
+    next_booking_id = first_id
+
+    for chunk_start in range(0, users, chunk_size):
+        user_rows = []
+        booking_rows = []
+        for i in range(chunk_start, min(chunk_start + chunk_size, users)):
+            user_id = first_id + i
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            created_at = window_start + timedelta(seconds=int(i * step) + rng.randint(0, int(step)))
+            user_rows.append((
+                user_id,
+                f'{first} {last}',
+                phone_number(user_id),
+                f'{first.lower()}.{last.lower()}{user_id % 1000}@{rng.choice(EMAIL_DOMAINS)}',
+                rng.choice([1, 1, 2, 2, 2, 3, 4, 5]),
+                scrambled_id('GH', user_id),
+                format_ts(created_at)
+            ))
+
+            if i in active_users:
+                kunda_number = free_kundas.pop()
+                status = 'approved' if rng.random() < 0.7 else 'pending'
+            elif rng.random() < rejected_ratio:
+                kunda_number = rng.randint(1, TOTAL_KUNDAS)
+                status = 'rejected'
+            else:
+                continue
+
+            booked_at = created_at + timedelta(seconds=rng.randint(60, 3 * 24 * 3600))
+            approved_at = None
+            if status == 'approved':
+                approved_at = format_ts(booked_at + timedelta(seconds=rng.randint(600, 2 * 24 * 3600)))
+            booking_rows.append((
+                next_booking_id, user_id, kunda_number, status,
+                scrambled_id('BK', next_booking_id), format_ts(booked_at), approved_at
+            ))
+            next_booking_id += 1
+
+        yield user_rows, booking_rows
+
+def write_live_event(conn, users, bookings):
+    conn.executemany('''
+        INSERT INTO user_registration (id, name, phone, email, members_count, registration_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', users)
+    conn.executemany('''
+        INSERT INTO booking (id, user_id, kunda_id, status, booking_id, booked_at, approved_at)
+        VALUES (?, ?, (SELECT id FROM homa_kunda WHERE kunda_number = ?), ?, ?, ?, ?)
+    ''', bookings)
+    conn.executemany('''
+        UPDATE homa_kunda SET status = 'booked', booked_by_id = ? WHERE kunda_number = ?
+    ''', ((b[1], b[2]) for b in bookings if b[3] != 'rejected'))
+
+def write_archived_event(conn, users, bookings, archived_at):
+    conn.executemany('''
+        INSERT INTO archive.user_registration (
+            original_id, name, phone, email, members_count, registration_id, created_at, archived_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (user + (archived_at,) for user in users))
+
+    users_by_id = {user[0]: user for user in users}
+    conn.executemany('''
+        INSERT INTO archive.booking (
+            original_id, user_id, kunda_number, status, booking_id, booked_at, approved_at,
+            name, phone, email, registration_id, members_count, archived_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        booking + (user[1], user[2], user[3], user[5], user[4], archived_at)
+        for booking in bookings
+        for user in (users_by_id[booking[1]],)
+    ))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic Gayathri Homa database.')
+    parser.add_argument('--users', type=int, default=1000, help='registrations per event')
+    parser.add_argument('--events', type=int, default=1,
+                        help='number of events; all but the latest are written to the archive')
+    parser.add_argument('--booked-kundas', type=int, default=60,
+                        help='kundas with a pending or approved booking per event')
+    parser.add_argument('--rejected-ratio', type=float, default=0.2,
+                        help='share of the remaining users with a rejected booking')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='fixtures/gayathri_homa_fixture.db')
+    args = parser.parse_args(argv)
+    if args.events < 1:
+        parser.error('--events must be at least 1')
+    if args.users < 0:
+        parser.error('--users must not be negative')
+
+    out_dir = os.path.dirname(args.out)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    archive_out = os.path.splitext(args.out)[0] + '_archive.db'
+
+    # Build into temporary files and move them into place at the end, so a
+    # half-written fixture is never picked up by a test run
+    live_tmp = args.out + '.tmp'
+    archive_tmp = archive_out + '.tmp'
+    stale = [live_tmp, archive_tmp]
+    if args.events == 1:
+        # Don't leave an archive from an earlier multi-event run next to this fixture
+        stale.append(archive_out)
+    for path in stale:
+        if os.path.exists(path):
+            os.remove(path)
+
+    started = time.time()
+    rng = random.Random(args.seed)
+    conn = sqlite3.connect(live_tmp, isolation_level=None)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA cache_size = -262144')  # 256 MB
+    if args.events > 1:
+        conn.execute('ATTACH DATABASE ? AS archive', (archive_tmp,))
+        conn.execute('PRAGMA archive.journal_mode = OFF')
+        conn.execute('PRAGMA archive.synchronous = OFF')
+        init_archive_db(conn)
+
+    total_rows = 0
+    conn.execute('BEGIN')
+    # No admin user: app.init_db() adds one the first time the app starts
+    cursor = conn.cursor()
+    create_tables(cursor)
+    create_kundas(cursor)
+    for event in range(args.events):
+        event_date = EVENT_DATE.replace(year=EVENT_DATE.year - (args.events - 1 - event))
+        archived_at = format_ts(event_date + timedelta(days=7))
+        user_count = booking_count = 0
+        for users, bookings in generate_event(
+            rng, event_date, event * args.users + 1,
+            args.users, args.booked_kundas, args.rejected_ratio
+        ):
+            if event == args.events - 1:
+                write_live_event(conn, users, bookings)
+            else:
+                write_archived_event(conn, users, bookings, archived_at)
+            user_count += len(users)
+            booking_count += len(bookings)
+        total_rows += user_count + booking_count
+        print(f"📝 Event {event_date.date()}: {user_count} registrations, {booking_count} bookings")
+    conn.execute('COMMIT')
+
+    conn.execute('ANALYZE main')
+    if args.events > 1:
+        conn.execute('ANALYZE archive')
+    conn.close()
+
+    os.replace(live_tmp, args.out)
+    print(f"✅ Live database: {args.out}")
+    if args.events > 1:
+        os.replace(archive_tmp, archive_out)
+        print(f"✅ Archive database: {archive_out}")
+    print(f"✅ {total_rows} rows generated in {time.time() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app runs init_db() when it is imported; point it at a scratch file so the
+# tests never touch the real database
+_scratch = tempfile.mkdtemp(prefix='gayathri-tests-')
+os.environ['GAYATHRI_DB_PATH'] = os.path.join(_scratch, 'import.db')
+os.environ['GAYATHRI_ARCHIVE_DB_PATH'] = os.path.join(_scratch, 'import_archive.db')
+
+import app  # noqa: E402
+import seed_fixtures  # noqa: E402
+
+USERS = 300
+
+
+@pytest.fixture(scope='session')
+def seeded_db(tmp_path_factory):
+    # Generated once per run and copied for each test
+    out = tmp_path_factory.mktemp('seed') / 'seed.db'
+    seed_fixtures.main([
+        '--users', str(USERS), '--booked-kundas', '50', '--rejected-ratio', '0.5',
+        '--seed', '7', '--out', str(out)
+    ])
+    return str(out)
+
+
+@pytest.fixture
+def databases(seeded_db, tmp_path, monkeypatch):
+    live = str(tmp_path / 'live.db')
+    archive = str(tmp_path / 'archive.db')
+    shutil.copyfile(seeded_db, live)
+
+    monkeypatch.setattr(app, 'DATABASE', live)
+    monkeypatch.setattr(app, 'ARCHIVE_DATABASE', archive)
+    app.invalidate_seatmap()
+    return live, archive
@@ -0,0 +1,165 @@
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+import app
+import schema
+from conftest import ROOT, USERS
+
+
+def start_archive(live, archive, *args):
+    env = dict(os.environ, GAYATHRI_DB_PATH=live, GAYATHRI_ARCHIVE_DB_PATH=archive)
+    return subprocess.Popen(
+        [sys.executable, '-u', os.path.join(ROOT, 'archive.py'), *args],
+        env=env, stdout=subprocess.PIPE, text=True
+    )
+
+
+def query(path, sql, params=()):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def counts(live, archive):
+    conn = sqlite3.connect(live)
+    conn.execute('ATTACH DATABASE ? AS archive', (archive,))
+    result = {
+        'live_rejected': conn.execute("SELECT COUNT(*) FROM main.booking WHERE status = 'rejected'").fetchone()[0],
+        'live_bookings': conn.execute('SELECT COUNT(*) FROM main.booking').fetchone()[0],
+        'live_users': conn.execute('SELECT COUNT(*) FROM main.user_registration').fetchone()[0],
+        'archived_bookings': conn.execute('SELECT COUNT(*) FROM archive.booking').fetchone()[0],
+        'archived_distinct': conn.execute('SELECT COUNT(DISTINCT original_id) FROM archive.booking').fetchone()[0],
+        'archived_users': conn.execute('SELECT COUNT(*) FROM archive.user_registration').fetchone()[0],
+        'booked_kundas': conn.execute("SELECT COUNT(*) FROM main.homa_kunda WHERE status = 'booked'").fetchone()[0],
+    }
+    conn.close()
+    return result
+
+
+def test_archive_resumes_after_being_killed(databases):
+    live, archive = databases
+    total = query(live, 'SELECT COUNT(*) FROM booking')[0][0]
+    rejected = query(live, "SELECT COUNT(*) FROM booking WHERE status = 'rejected'")[0][0]
+    booked = query(live, "SELECT COUNT(*) FROM homa_kunda WHERE status = 'booked'")[0][0]
+    assert rejected > 20
+
+    job = start_archive(live, archive, '--batch-size', '10', '--pause', '0.5')
+    for line in job.stdout:
+        if 'rows archived' in line:
+            break
+    job.send_signal(signal.SIGKILL)
+    job.wait()
+
+    partial = counts(live, archive)
+    assert 0 < partial['archived_bookings'] < rejected
+    assert partial['live_bookings'] + partial['archived_bookings'] == total
+    assert partial['archived_distinct'] == partial['archived_bookings']
+
+    job = start_archive(live, archive, '--batch-size', '10', '--pause', '0')
+    job.communicate()
+    assert job.returncode == 0
+
+    final = counts(live, archive)
+    assert final['live_rejected'] == 0
+    assert final['live_bookings'] == total - rejected
+    assert final['archived_bookings'] == final['archived_distinct'] == rejected
+    assert final['live_users'] == USERS
+    assert final['booked_kundas'] == booked
+
+
+def test_event_completed_archives_everything(databases):
+    live, archive = databases
+    total = query(live, 'SELECT COUNT(*) FROM booking')[0][0]
+
+    job = start_archive(live, archive, '--event-completed', '--pause', '0')
+    job.communicate()
+    assert job.returncode == 0
+
+    final = counts(live, archive)
+    assert final['live_bookings'] == final['live_users'] == 0
+    assert final['archived_bookings'] == total
+    assert final['archived_users'] == USERS
+    assert final['booked_kundas'] == 0
+
+
+@pytest.mark.parametrize('archived', [False, True])
+def test_one_booking_per_user_does_not_depend_on_archival(databases, archived):
+    live, archive = databases
+    rejected_user, rejected_kunda = query(live, '''
+        SELECT b.user_id, k.kunda_number FROM booking b JOIN homa_kunda k ON b.kunda_id = k.id
+        WHERE b.status = 'rejected' ORDER BY b.id LIMIT 1
+    ''')[0]
+    active_user = query(live, "SELECT user_id FROM booking WHERE status != 'rejected' ORDER BY id LIMIT 1")[0][0]
+    free_kunda = query(live, "SELECT kunda_number FROM homa_kunda WHERE status = 'available' LIMIT 1")[0][0]
+    total = query(live, 'SELECT COUNT(*) FROM booking')[0][0]
+    rejected = query(live, "SELECT COUNT(*) FROM booking WHERE status = 'rejected'")[0][0]
+    if archived:
+        start_archive(live, archive, '--pause', '0').communicate()
+
+    client = app.app.test_client()
+    for user_id in (rejected_user, active_user):
+        response = client.post('/api/bookings', json={'user_id': user_id, 'kunda_number': free_kunda})
+        assert response.status_code == 400
+        assert 'Only one booking per user' in response.get_json()['error']
+
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+    stats = client.get('/api/admin/stats').get_json()['stats']
+    assert stats['rejected_bookings'] == rejected
+    assert stats['total_bookings'] == total
+    users = {user['id']: user for user in client.get('/api/admin/users').get_json()['users']}
+    assert users[rejected_user]['booking_status'] == 'rejected'
+    assert users[rejected_user]['kunda_number'] == rejected_kunda
+    assert users[rejected_user]['booking_count'] == 1
+    assert users[active_user]['booking_status'] in ('pending', 'approved')
+
+
+def test_archived_rows_do_not_leak_into_a_reset_database(databases, tmp_path, monkeypatch):
+    live, archive = databases
+    start_archive(live, archive, '--pause', '0').communicate()
+    # Reuse the id of a user whose rejected booking is now archived
+    user_id = query(archive, 'SELECT user_id FROM booking ORDER BY id LIMIT 1')[0][0]
+
+    # A fresh live database restarts user ids
+    fresh = str(tmp_path / 'fresh.db')
+    conn = sqlite3.connect(fresh)
+    schema.create_tables(conn.cursor())
+    schema.create_kundas(conn.cursor())
+    conn.execute(
+        'INSERT INTO user_registration (id, name, phone, email, members_count, registration_id) VALUES (?, ?, ?, ?, ?, ?)',
+        (user_id, 'New User', '8000000001', 'new@example.com', 1, 'GHNEWUSER')
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(app, 'DATABASE', fresh)
+
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+    assert client.get('/api/admin/stats').get_json()['stats']['rejected_bookings'] == 0
+    user = client.get('/api/admin/users').get_json()['users'][0]
+    assert user['booking_status'] is None
+    assert user['booking_count'] == 0
+    response = client.post('/api/bookings', json={'user_id': user_id, 'kunda_number': 60})
+    assert response.status_code == 200
+
+
+def test_archive_listing_clamps_paging(databases):
+    live, archive = databases
+    start_archive(live, archive, '--pause', '0').communicate()
+
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+
+    response = client.get('/api/admin/archive/bookings?limit=-1')
+    assert response.status_code == 200
+    assert len(response.get_json()['bookings']) == 1
+    assert client.get('/api/admin/archive/bookings?offset=-1').status_code == 400
@@ -0,0 +1,77 @@
+import app
+
+
+def decode(payload):
+    # Expand the run-length map back to {kunda_number: booked_by_name or None}
+    seats = {}
+    number = payload['f']
+    booked = iter(payload['b'])
+    for i, run in enumerate(payload['r']):
+        available = i % 2 == 0
+        for _ in range(run):
+            if available:
+                seats[number] = None
+            else:
+                index = next(booked)
+                seats[number] = payload['d'][index] if index >= 0 else ''
+            number += 1
+    assert next(booked, None) is None
+    assert len(seats) == payload['n']
+    return seats
+
+
+def expected(client):
+    kundas = client.get('/api/kundas').get_json()['kundas']
+    return {
+        k['kunda_number']: (k['booked_by_name'] or '') if k['status'] != 'available' else None
+        for k in kundas
+    }
+
+
+def test_seatmap_matches_kundas(databases):
+    client = app.app.test_client()
+    response = client.get('/api/kundas/seatmap')
+    assert response.status_code == 200
+
+    seats = decode(response.get_json())
+    assert seats == expected(client)
+    assert any(name for name in seats.values())
+    assert len(response.data) < len(client.get('/api/kundas').data) / 10
+
+
+def test_seatmap_etag_and_invalidation(databases):
+    live, _ = databases
+    client = app.app.test_client()
+
+    first = client.get('/api/kundas/seatmap')
+    etag = first.headers['ETag']
+    unchanged = client.get('/api/kundas/seatmap', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b''
+
+    # New booking: the cached map is rebuilt
+    user = client.post('/api/register', json={
+        'name': 'Seat Map', 'phone': '8123456789', 'email': 'seat@example.com', 'members': 2
+    }).get_json()['user']
+    free_kunda = next(number for number, name in decode(first.get_json()).items() if name is None)
+    response = client.post('/api/bookings', json={'user_id': user['id'], 'kunda_number': free_kunda})
+    assert response.status_code == 200
+    booking_id = response.get_json()['booking']['booking_id']
+
+    booked = client.get('/api/kundas/seatmap', headers={'If-None-Match': etag})
+    assert booked.status_code == 200
+    assert booked.headers['ETag'] != etag
+    assert decode(booked.get_json())[free_kunda] == 'Seat Map'
+    assert decode(booked.get_json()) == expected(client)
+
+    # Admin reject frees the kunda again
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+    response = client.post('/api/admin/bookings/reject', json={'booking_id': booking_id})
+    assert response.status_code == 200
+
+    rejected = client.get('/api/kundas/seatmap', headers={'If-None-Match': booked.headers['ETag']})
+    assert rejected.status_code == 200
+    assert rejected.headers['ETag'] != booked.headers['ETag']
+    assert decode(rejected.get_json())[free_kunda] is None
+    assert decode(rejected.get_json()) == expected(client)
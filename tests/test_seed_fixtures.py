@@ -0,0 +1,45 @@
+import filecmp
+import sqlite3
+
+import seed_fixtures
+
+
+def generate(tmp_path, name, *args):
+    out = str(tmp_path / name)
+    seed_fixtures.main(['--users', '500', '--events', '3', '--out', out, *args])
+    return out, out[:-len('.db')] + '_archive.db'
+
+
+def test_same_seed_gives_identical_files(tmp_path):
+    live_a, archive_a = generate(tmp_path, 'a.db', '--seed', '11')
+    live_b, archive_b = generate(tmp_path, 'b.db', '--seed', '11')
+    live_c, _ = generate(tmp_path, 'c.db', '--seed', '12')
+
+    assert filecmp.cmp(live_a, live_b, shallow=False)
+    assert filecmp.cmp(archive_a, archive_b, shallow=False)
+    assert not filecmp.cmp(live_a, live_c, shallow=False)
+
+
+def test_booked_kundas_match_their_bookings(seeded_db):
+    conn = sqlite3.connect(seeded_db)
+
+    # Every booked kunda points at the user holding its pending/approved booking
+    mismatched = conn.execute('''
+        SELECT k.kunda_number FROM homa_kunda k
+        WHERE k.status = 'booked' AND NOT EXISTS (
+            SELECT 1 FROM booking b
+            WHERE b.kunda_id = k.id AND b.user_id = k.booked_by_id AND b.status != 'rejected'
+        )
+    ''').fetchall()
+    assert mismatched == []
+
+    # ...and every pending/approved booking holds a booked kunda
+    live = conn.execute("SELECT COUNT(*) FROM booking WHERE status != 'rejected'").fetchone()[0]
+    booked = conn.execute("SELECT COUNT(*) FROM homa_kunda WHERE status = 'booked'").fetchone()[0]
+    assert live == booked == 50
+
+    # One booking per user
+    assert conn.execute(
+        'SELECT COUNT(*) FROM (SELECT user_id FROM booking GROUP BY user_id HAVING COUNT(*) > 1)'
+    ).fetchone()[0] == 0
+    conn.close()